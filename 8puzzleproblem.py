@@ -2,120 +2,155 @@ import heapq
 import copy
 import time
 
+GOAL_KEY = 0x087654321  # tiles 1-8 then the blank, 4 bits per cell
+MOVES = [
+    ('UP', -1, 0),
+    ('DOWN', 1, 0),
+    ('LEFT', 0, -1),
+    ('RIGHT', 0, 1)
+]
+
+INVERSE_MOVE = {'UP': 'DOWN', 'DOWN': 'UP', 'LEFT': 'RIGHT', 'RIGHT': 'LEFT'}
+
+# NEIGHBOR_IDX[pos] lists (move, new_pos) for every legal blank move from pos
+NEIGHBOR_IDX = [
+    [(move, (pos // 3 + dx) * 3 + pos % 3 + dy) for move, dx, dy in MOVES
+     if 0 <= pos // 3 + dx < 3 and 0 <= pos % 3 + dy < 3]
+    for pos in range(9)
+]
+
+# MD[tile][pos] is the Manhattan distance of tile from its goal when at pos
+MD = [[0] * 9] + [
+    [abs((tile - 1) // 3 - pos // 3) + abs((tile - 1) % 3 - pos % 3) for pos in range(9)]
+    for tile in range(1, 9)
+]
+
+def pack_board(board):
+    """Pack a 3x3 board into a single int key, 4 bits per cell."""
+    key = 0
+    for pos, tile in enumerate(num for row in board for num in row):
+        key |= tile << (4 * pos)
+    return key
+
+def unpack_board(key):
+    """Unpack a board key into a flat list of 9 tiles."""
+    return [(key >> (4 * pos)) & 0xF for pos in range(9)]
+
+def key_blank_pos(key):
+    """Find the flat index of the blank tile (0) in a board key."""
+    for pos in range(9):
+        if not (key >> (4 * pos)) & 0xF:
+            return pos
+
+def key_manhattan_distance(key):
+    """Calculate Manhattan distance heuristic for a board key."""
+    return sum(MD[(key >> (4 * pos)) & 0xF][pos] for pos in range(9))
+
+def key_neighbors(key, blank, h, last_move=None):
+    """Generate (move, neighbor_key, new_blank, neighbor_h) tuples for a board key.
+
+    The move that would undo last_move is skipped.
+    """
+    skip = INVERSE_MOVE.get(last_move)
+    for move, new_blank in NEIGHBOR_IDX[blank]:
+        if move == skip:
+            continue
+        # Slide the tile into the blank cell; the blank nibble is zero and
+        # only the moved tile changes its distance to the goal
+        tile = (key >> (4 * new_blank)) & 0xF
+        yield (move, key ^ (tile << (4 * blank)) ^ (tile << (4 * new_blank)), new_blank,
+               h - MD[tile][new_blank] + MD[tile][blank])
+
 class PuzzleState:
-    def __init__(self, board, parent=None, move=None, depth=0):
-        self.board = board
-        self.parent = parent
-        self.move = move
-        self.depth = depth
-        self.cost = self.depth + self.manhattan_distance()
+    """A board packed into its int key; the A* search itself works on bare keys."""
+    __slots__ = ('board',)
     
-    def __lt__(self, other):
-        return self.cost < other.cost
+    def __init__(self, board):
+        self.board = board
     
     def __eq__(self, other):
         return self.board == other.board
     
     def __hash__(self):
-        return hash(str(self.board))
-    
-    def get_blank_pos(self):
-        """Find the position of the blank tile (0)."""
-        for i in range(3):
-            for j in range(3):
-                if self.board[i][j] == 0:
-                    return i, j
-    
-    def manhattan_distance(self):
-        """Calculate Manhattan distance heuristic."""
-        distance = 0
-        for i in range(3):
-            for j in range(3):
-                if self.board[i][j] != 0:
-                    x_goal, y_goal = divmod(self.board[i][j] - 1, 3)
-                    distance += abs(x_goal - i) + abs(y_goal - j)
-        return distance
-    
-    def is_goal(self):
-        """Check if current state is the goal state."""
-        return self.board == [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
-    
-    def get_neighbors(self):
-        """Generate all possible next states."""
-        neighbors = []
-        x, y = self.get_blank_pos()
-        moves = [
-            ('UP', -1, 0),
-            ('DOWN', 1, 0),
-            ('LEFT', 0, -1),
-            ('RIGHT', 0, 1)
-        ]
-        
-        for move, dx, dy in moves:
-            new_x, new_y = x + dx, y + dy
-            if 0 <= new_x < 3 and 0 <= new_y < 3:
-                new_board = [row[:] for row in self.board]
-                new_board[x][y], new_board[new_x][new_y] = new_board[new_x][new_y], new_board[x][y]
-                neighbors.append(PuzzleState(new_board, self, move, self.depth + 1))
-        
-        return neighbors
+        return hash(self.board)
 
 class PuzzleSolver:
     def __init__(self, initial_board):
-        self.initial_state = PuzzleState(initial_board)
+        self.initial_state = PuzzleState(pack_board(initial_board))
         self.moves_made = []
+        self._solvable = None
     
     def is_solvable(self):
-        """Check if the puzzle is solvable using inversion count."""
-        flat_board = [num for row in self.initial_state.board for num in row if num != 0]
-        inversions = 0
-        for i in range(len(flat_board)):
-            for j in range(i + 1, len(flat_board)):
-                if flat_board[i] > flat_board[j]:
-                    inversions += 1
-        return inversions % 2 == 0
+        """Check if the puzzle is solvable using inversion count (cached)."""
+        if self._solvable is None:
+            flat_board = [num for num in unpack_board(self.initial_state.board) if num != 0]
+            inversions = 0
+            for i in range(len(flat_board)):
+                for j in range(i + 1, len(flat_board)):
+                    if flat_board[i] > flat_board[j]:
+                        inversions += 1
+            self._solvable = inversions % 2 == 0
+        return self._solvable
     
     def solve(self):
-        """Solve the puzzle using A* search."""
+        """Solve the puzzle using A* graph search."""
         if not self.is_solvable():
             return None
         
         start_time = time.time()
         
-        open_set = []
-        closed_set = set()
-        
-        heapq.heappush(open_set, self.initial_state)
+        start_key = self.initial_state.board
+        best_g = {start_key: 0}
+        came_from = {start_key: None}
+        # Heap entries are plain (f, -g, key, blank) tuples so comparisons never
+        # reach state objects; ties on f favour the deeper, closer-to-goal node
+        open_set = [(key_manhattan_distance(start_key), 0, start_key, key_blank_pos(start_key))]
+        nodes_explored = 0
         
         while open_set:
-            current_state = heapq.heappop(open_set)
+            f, neg_g, key, blank = heapq.heappop(open_set)
+            g = -neg_g
+            
+            # Skip stale heap entries superseded by a cheaper path
+            if g > best_g[key]:
+                continue
             
-            if current_state.is_goal():
+            if key == GOAL_KEY:
                 end_time = time.time()
-                self.get_solution_path(current_state)
+                self.get_solution_path(came_from, key)
                 return {
                     'moves': self.moves_made,
-                    'nodes_explored': len(closed_set),
+                    'nodes_explored': nodes_explored,
                     'time_taken': end_time - start_time,
-                    'solution_depth': current_state.depth
+                    'solution_depth': g
                 }
             
-            closed_set.add(current_state)
+            nodes_explored += 1
             
-            for neighbor in current_state.get_neighbors():
-                if neighbor in closed_set:
-                    continue
-                
-                heapq.heappush(open_set, neighbor)
+            # The parent always has a smaller g, so never generate it again
+            step = came_from[key]
+            last_move = step[1] if step else None
+            
+            new_g = g + 1
+            for move, neighbor_key, new_blank, neighbor_h in key_neighbors(key, blank, f - g,
+                                                                           last_move):
+                if new_g < best_g.get(neighbor_key, float('inf')):
+                    best_g[neighbor_key] = new_g
+                    came_from[neighbor_key] = (key, move)
+                    heapq.heappush(open_set, (new_g + neighbor_h, -new_g, neighbor_key, new_blank))
         
         return None
     
-    def get_solution_path(self, final_state):
+    def get_solution_path(self, came_from, final_key):
         """Reconstruct the solution path."""
-        current = final_state
-        while current.parent:
-            self.moves_made.insert(0, current.move)
-            current = current.parent
+        moves = []
+        step = came_from[final_key]
+        while step:
+            parent_key, move = step
+            moves.append(move)
+            step = came_from[parent_key]
+        moves.reverse()
+        self.moves_made = moves
 
 def print_board(board):
     """Print the puzzle board in a readable format."""
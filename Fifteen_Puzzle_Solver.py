@@ -1,66 +1,362 @@
 from collections import deque
+from functools import lru_cache
 import time
 import random
 
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:  # Numba is optional; the search kernel then runs as plain Python
+    np = None
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that returns the function unchanged."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Moves are named after the direction the tile slides into the blank
+MOVES = [
+    (0, 1, "LEFT"),
+    (0, -1, "RIGHT"),
+    (1, 0, "UP"),
+    (-1, 0, "DOWN")
+]
+
+INVERSE_MOVE = {"LEFT": "RIGHT", "RIGHT": "LEFT", "UP": "DOWN", "DOWN": "UP"}
+
+# NEIGHBOR_IDX[pos] lists (new_pos, move) for every legal blank move from pos
+NEIGHBOR_IDX = [
+    [((pos // 4 + di) * 4 + pos % 4 + dj, move) for di, dj, move in MOVES
+     if 0 <= pos // 4 + di < 4 and 0 <= pos % 4 + dj < 4]
+    for pos in range(16)
+]
+
+# MD[tile][pos] is the Manhattan distance of tile from its goal when at pos
+MD = [[0] * 16] + [
+    [abs((tile - 1) // 4 - pos // 4) + abs((tile - 1) % 4 - pos % 4) for pos in range(16)]
+    for tile in range(1, 16)
+]
+
+def count_line_conflicts(codes):
+    """Count the extra moves forced by reversed tiles within one line.
+
+    codes holds, in line order, the goal slot (1-4) of each tile already
+    in its goal line, or 0 for any other cell. Every tile outside the
+    longest increasing run must leave the line and come back.
+    """
+    goals = [code for code in codes if code]
+    longest = [1] * len(goals)
+    for i in range(len(goals)):
+        for j in range(i):
+            if goals[j] < goals[i]:
+                longest[i] = max(longest[i], longest[j] + 1)
+    return 2 * (len(goals) - max(longest, default=0))
+
+# LC_TABLE[idx] is the conflict count for a line whose codes are the base-5
+# digits of idx; ROW_CODE/COL_CODE give each tile's digit at each position
+LC_TABLE = [count_line_conflicts([idx // 5 ** k % 5 for k in range(4)])
+            for idx in range(5 ** 4)]
+ROW_CODE = [[0] * 16] + [
+    [((tile - 1) % 4 + 1) * 5 ** (pos % 4) if (tile - 1) // 4 == pos // 4 else 0
+     for pos in range(16)]
+    for tile in range(1, 16)
+]
+COL_CODE = [[0] * 16] + [
+    [((tile - 1) // 4 + 1) * 5 ** (pos // 4) if (tile - 1) % 4 == pos % 4 else 0
+     for pos in range(16)]
+    for tile in range(1, 16)
+]
+
+def row_conflicts(board, row):
+    """Linear-conflict penalty for one row of a packed board."""
+    return LC_TABLE[sum(ROW_CODE[(board >> (4 * pos)) & 0xF][pos]
+                        for pos in range(row * 4, row * 4 + 4))]
+
+def col_conflicts(board, col):
+    """Linear-conflict penalty for one column of a packed board."""
+    return LC_TABLE[sum(COL_CODE[(board >> (4 * pos)) & 0xF][pos]
+                        for pos in range(col, 16, 4))]
+
+def as_array(values):
+    """Convert a list of ints to the sequence type the search kernel expects."""
+    return np.array(values, dtype=np.int64) if np is not None else list(values)
+
+# Flat lookup tables for the search kernel. NEIGHBOR_ARRAY[pos * 4 + d] is the
+# blank's new position after MOVES[d], or -1 when that move is illegal
+NEIGHBOR_ARRAY = as_array([
+    (pos // 4 + di) * 4 + pos % 4 + dj if 0 <= pos // 4 + di < 4 and 0 <= pos % 4 + dj < 4
+    else -1
+    for pos in range(16) for di, dj, _ in MOVES
+])
+MD_ARRAY = as_array([MD[tile][pos] for tile in range(16) for pos in range(16)])
+ROW_CODE_ARRAY = as_array([ROW_CODE[tile][pos] for tile in range(16) for pos in range(16)])
+COL_CODE_ARRAY = as_array([COL_CODE[tile][pos] for tile in range(16) for pos in range(16)])
+LC_ARRAY = as_array(LC_TABLE)
+
+# Disjoint tile groups (the four 2x2 quadrants) for the additive pattern
+# databases. A group's index packs its tiles' positions, 4 bits per tile, so
+# GROUP_ARRAY[tile] names the tile's group and WEIGHT_ARRAY[tile] its place value
+PATTERN_GROUPS = ((1, 2, 5, 6), (3, 4, 7, 8), (9, 10, 13, 14), (11, 12, 15))
+PATTERN_SIZE = 16 ** 4
+GROUP_ARRAY = as_array([next((g for g, group in enumerate(PATTERN_GROUPS) if tile in group), 0)
+                        for tile in range(16)])
+WEIGHT_ARRAY = as_array([16 ** PATTERN_GROUPS[GROUP_ARRAY[tile]].index(tile) if tile else 0
+                         for tile in range(16)])
+
+def build_pattern_database(group):
+    """Breadth-first search over the positions of one tile group.
+
+    Entry idx holds the fewest moves of the group's own tiles needed to
+    bring them home, where a tile may slide into any neighbouring cell
+    not held by another tile of the group. Other tiles and the blank are
+    ignored, so the counts for disjoint groups can be added together.
+    """
+    table = bytearray([0xFF]) * PATTERN_SIZE
+    weights = [16 ** slot for slot in range(len(group))]
+    goal = sum((tile - 1) * weight for tile, weight in zip(group, weights))
+    table[goal] = 0
+    
+    frontier = [goal]
+    distance = 0
+    while frontier:
+        distance += 1
+        next_frontier = []
+        for idx in frontier:
+            positions = [(idx // weight) % 16 for weight in weights]
+            for pos, weight in zip(positions, weights):
+                for new_pos, _ in NEIGHBOR_IDX[pos]:
+                    if new_pos not in positions:
+                        new_idx = idx + (new_pos - pos) * weight
+                        if table[new_idx] == 0xFF:
+                            table[new_idx] = distance
+                            next_frontier.append(new_idx)
+        frontier = next_frontier
+    
+    return table
+
+@lru_cache(maxsize=None)
+def pattern_databases():
+    """Build the databases for PATTERN_GROUPS once, laid end to end."""
+    tables = bytearray()
+    for group in PATTERN_GROUPS:
+        tables += build_pattern_database(group)
+    return np.frombuffer(tables, dtype=np.uint8) if np is not None else tables
+
+def pattern_indices(tiles):
+    """Compute each pattern group's database index for a flat tile list."""
+    indices = [0] * len(PATTERN_GROUPS)
+    for pos, tile in enumerate(tiles):
+        if tile:
+            indices[GROUP_ARRAY[tile]] += pos * WEIGHT_ARRAY[tile]
+    return indices
+
+@njit(cache=True)
+def tiles_row_conflicts(tiles, row):
+    """Linear-conflict penalty for one row of a flat tile array."""
+    pos = row * 4
+    return LC_ARRAY[ROW_CODE_ARRAY[tiles[pos] * 16 + pos] +
+                    ROW_CODE_ARRAY[tiles[pos + 1] * 16 + pos + 1] +
+                    ROW_CODE_ARRAY[tiles[pos + 2] * 16 + pos + 2] +
+                    ROW_CODE_ARRAY[tiles[pos + 3] * 16 + pos + 3]]
+
+@njit(cache=True)
+def tiles_col_conflicts(tiles, col):
+    """Linear-conflict penalty for one column of a flat tile array."""
+    return LC_ARRAY[COL_CODE_ARRAY[tiles[col] * 16 + col] +
+                    COL_CODE_ARRAY[tiles[col + 4] * 16 + col + 4] +
+                    COL_CODE_ARRAY[tiles[col + 8] * 16 + col + 8] +
+                    COL_CODE_ARRAY[tiles[col + 12] * 16 + col + 12]]
+
+@njit(cache=True)
+def ida_search(tiles, blank, bound, manhattan, linear_conflict, pattern_cost, group_indices,
+               pattern_db, moves):
+    """One IDA* iteration over a mutable flat tile array.
+
+    The heuristic is the larger of Manhattan distance plus linear conflicts
+    and the additive pattern-database cost; group_indices is updated in
+    place alongside tiles. Returns (length, next_bound). On success length
+    is the solution length and moves holds the direction index (into
+    MOVES) of each move; otherwise length is -1 and next_bound is the
+    smallest f-cost that exceeded bound. The search tracks one frame per
+    depth instead of recursing, and undoes each move in place when it
+    backtracks.
+    """
+    h = max(manhattan + linear_conflict, pattern_cost)
+    if h > bound:
+        return -1, h
+    
+    next_bound = 1 << 30
+    
+    blanks = [0] * (bound + 1)
+    manhattans = [0] * (bound + 1)
+    conflicts = [0] * (bound + 1)
+    patterns = [0] * (bound + 1)
+    next_dirs = [0] * (bound + 1)
+    blanks[0] = blank
+    manhattans[0] = manhattan
+    conflicts[0] = linear_conflict
+    patterns[0] = pattern_cost
+    g = 0
+    
+    while True:
+        if manhattans[g] == 0:
+            return g, bound
+        
+        d = next_dirs[g]
+        if d == 4:
+            # Children exhausted: step back and undo the move that led here
+            if g == 0:
+                return -1, next_bound
+            g -= 1
+            tile = tiles[blanks[g]]
+            group_indices[GROUP_ARRAY[tile]] += (blanks[g + 1] - blanks[g]) * WEIGHT_ARRAY[tile]
+            tiles[blanks[g + 1]] = tile
+            tiles[blanks[g]] = 0
+            continue
+        next_dirs[g] = d + 1
+        
+        # Moves pair up as (LEFT, RIGHT) and (UP, DOWN); never undo the last one
+        if g > 0 and d == moves[g - 1] ^ 1:
+            continue
+        
+        b = blanks[g]
+        nb = NEIGHBOR_ARRAY[b * 4 + d]
+        if nb < 0:
+            continue
+        
+        tile = tiles[nb]
+        new_manhattan = manhattans[g] - MD_ARRAY[tile * 16 + nb] + MD_ARRAY[tile * 16 + b]
+        
+        # Only the lines the tile leaves and enters can change conflicts
+        vertical = nb // 4 != b // 4
+        if vertical:
+            before = tiles_row_conflicts(tiles, nb // 4) + tiles_row_conflicts(tiles, b // 4)
+        else:
+            before = tiles_col_conflicts(tiles, nb % 4) + tiles_col_conflicts(tiles, b % 4)
+        tiles[b] = tile
+        tiles[nb] = 0
+        if vertical:
+            after = tiles_row_conflicts(tiles, nb // 4) + tiles_row_conflicts(tiles, b // 4)
+        else:
+            after = tiles_col_conflicts(tiles, nb % 4) + tiles_col_conflicts(tiles, b % 4)
+        new_conflict = conflicts[g] - before + after
+        
+        # Only the moved tile's group changes its pattern-database entry
+        group = GROUP_ARRAY[tile]
+        old_index = group_indices[group]
+        new_index = old_index + (b - nb) * WEIGHT_ARRAY[tile]
+        new_pattern = (patterns[g] - pattern_db[group * PATTERN_SIZE + old_index]
+                       + pattern_db[group * PATTERN_SIZE + new_index])
+        
+        # Prune once the f-cost exceeds the bound, remembering the smallest overshoot
+        f = g + 1 + max(new_manhattan + new_conflict, new_pattern)
+        if f > bound:
+            next_bound = min(next_bound, f)
+            tiles[nb] = tile
+            tiles[b] = 0
+            continue
+        
+        moves[g] = d
+        g += 1
+        blanks[g] = nb
+        manhattans[g] = new_manhattan
+        conflicts[g] = new_conflict
+        patterns[g] = new_pattern
+        next_dirs[g] = 0
+        group_indices[group] = new_index
+
+def swap_nibbles(board, i, j):
+    """Swap the tiles at flat positions i and j of a packed board."""
+    diff = ((board >> (4 * i)) ^ (board >> (4 * j))) & 0xF
+    return board ^ (diff << (4 * i)) ^ (diff << (4 * j))
+
+def board_neighbors(board, blank, manhattan, linear_conflict, last_move=None):
+    """Yield (new_board, new_blank, manhattan, linear_conflict, move) for each move.
+
+    The move that would undo last_move is skipped.
+    """
+    skip = INVERSE_MOVE.get(last_move)
+    for new_blank, move in NEIGHBOR_IDX[blank]:
+        if move == skip:
+            continue
+        # Slide the tile into the blank cell; only it changes its distance to the goal
+        tile = (board >> (4 * new_blank)) & 0xF
+        new_board = swap_nibbles(board, blank, new_blank)
+        new_manhattan = manhattan - MD[tile][new_blank] + MD[tile][blank]
+        
+        # Only the lines the tile leaves and enters can change conflicts
+        if new_blank // 4 != blank // 4:
+            old_line, new_line = new_blank // 4, blank // 4
+            line_conflicts = row_conflicts
+        else:
+            old_line, new_line = new_blank % 4, blank % 4
+            line_conflicts = col_conflicts
+        new_linear_conflict = (linear_conflict
+                               - line_conflicts(board, old_line) - line_conflicts(board, new_line)
+                               + line_conflicts(new_board, old_line)
+                               + line_conflicts(new_board, new_line))
+        yield new_board, new_blank, new_manhattan, new_linear_conflict, move
+
+def pack_board(board):
+    """Pack a 4x4 board into a single int, 4 bits per tile."""
+    packed = 0
+    for pos, tile in enumerate(tile for row in board for tile in row):
+        packed |= tile << (4 * pos)
+    return packed
+
+def unpack_board(packed):
+    """Unpack a packed board into a tuple of row tuples."""
+    return tuple(tuple((packed >> (4 * (i * 4 + j))) & 0xF for j in range(4))
+                 for i in range(4))
+
 class PuzzleState:
-    GOAL_STATE = tuple(tuple(i * 4 + j + 1 if i * 4 + j < 15 else 0 
-                     for j in range(4)) for i in range(4))
+    __slots__ = ('board', '_hash', '_blank_pos', '_manhattan', '_linear_conflict')
+    
+    GOAL_STATE = pack_board((i * 4 + j + 1 if i * 4 + j < 15 else 0
+                             for j in range(4)) for i in range(4))
     
-    def __init__(self, board=None):
-        self.board = board if board else self.GOAL_STATE
+    def __init__(self, board=None, manhattan=None, linear_conflict=None, blank_pos=None):
+        self.board = board if board is not None else self.GOAL_STATE
         self._hash = None
-        self._blank_pos = None
-        self._manhattan = None
+        self._blank_pos = blank_pos
+        self._manhattan = manhattan
+        self._linear_conflict = linear_conflict
     
     def get_blank_position(self):
         """Find position of blank (0) tile with caching."""
         if self._blank_pos is None:
-            for i in range(4):
-                for j in range(4):
-                    if self.board[i][j] == 0:
-                        self._blank_pos = (i, j)
-                        break
-        return self._blank_pos
+            for pos in range(16):
+                if not (self.board >> (4 * pos)) & 0xF:
+                    self._blank_pos = pos
+                    break
+        return divmod(self._blank_pos, 4)
     
     def manhattan_distance(self):
         """Calculate Manhattan distance with caching."""
         if self._manhattan is None:
-            distance = 0
-            for i in range(4):
-                for j in range(4):
-                    tile = self.board[i][j]
-                    if tile != 0:
-                        goal_row, goal_col = (tile - 1) // 4, (tile - 1) % 4
-                        distance += abs(goal_row - i) + abs(goal_col - j)
-            self._manhattan = distance
+            self._manhattan = sum(MD[(self.board >> (4 * pos)) & 0xF][pos]
+                                  for pos in range(16))
         return self._manhattan
     
-    def get_neighbors(self):
-        """Generate all possible next states efficiently."""
+    def linear_conflict(self):
+        """Calculate the linear-conflict penalty with caching."""
+        if self._linear_conflict is None:
+            self._linear_conflict = (sum(row_conflicts(self.board, row) for row in range(4)) +
+                                     sum(col_conflicts(self.board, col) for col in range(4)))
+        return self._linear_conflict
+    
+    def heuristic(self):
+        """Admissible estimate: Manhattan distance plus linear conflicts."""
+        return self.manhattan_distance() + self.linear_conflict()
+    
+    def get_neighbors(self, last_move=None):
+        """Generate all possible next states, skipping the inverse of last_move."""
         i, j = self.get_blank_position()
-        moves = [
-            (0, 1, "LEFT"), 
-            (0, -1, "RIGHT"),
-            (1, 0, "UP"), 
-            (-1, 0, "DOWN")
-        ]
-        
-        neighbors = []
-        board_list = [list(row) for row in self.board]
-        
-        for di, dj, move in moves:
-            new_i, new_j = i + di, j + dj
-            if 0 <= new_i < 4 and 0 <= new_j < 4:
-                # Create new board state
-                new_board = [row[:] for row in board_list]
-                new_board[i][j], new_board[new_i][new_j] = \
-                    new_board[new_i][new_j], new_board[i][j]
-                neighbors.append((
-                    PuzzleState(tuple(tuple(row) for row in new_board)),
-                    move
-                ))
-        
-        return neighbors
+        return [(PuzzleState(new_board, manhattan, linear_conflict, new_blank), move)
+                for new_board, new_blank, manhattan, linear_conflict, move
+                in board_neighbors(self.board, i * 4 + j, self.manhattan_distance(),
+                                   self.linear_conflict(), last_move)]
     
     def __eq__(self, other):
         return self.board == other.board
@@ -71,18 +367,17 @@ class PuzzleState:
         return self._hash
 
 class IDSSolver:
+    """Solve the 15-puzzle with IDA*, deepening on the f-cost bound rather than depth."""
+    
     def __init__(self, initial_state):
         self.initial_state = initial_state
-        self.goal_state = PuzzleState()
-        self.visited_states = set()
-        self.current_path = set()
         self.solution = []
     
     def is_solvable(self):
         """Check if the puzzle is solvable."""
         flat_board = []
         blank_row = 0
-        for i, row in enumerate(self.initial_state.board):
+        for i, row in enumerate(unpack_board(self.initial_state.board)):
             for num in row:
                 if num != 0:
                     flat_board.append(num)
@@ -96,97 +391,53 @@ class IDSSolver:
         blank_row_from_bottom = 3 - blank_row
         return (blank_row_from_bottom % 2 == 0) == (inversions % 2 == 0)
     
-    def dls(self, state, depth, path):
-        """Depth-limited search with optimizations."""
-        if depth < 0:
-            return False
-        
-        if state.board == self.goal_state.board:
-            self.solution = path
-            return True
-        
-        # Prune if Manhattan distance exceeds remaining depth
-        if state.manhattan_distance() > depth:
-            return False
-        
-        # Use current_path set for cycle detection in current path
-        state_hash = hash(state)
-        if state_hash in self.current_path:
-            return False
-        
-        self.current_path.add(state_hash)
-        
-        for next_state, move in state.get_neighbors():
-            next_hash = hash(next_state)
-            
-            # Skip if we've seen this state in a better path
-            if next_hash in self.visited_states:
-                continue
-            
-            if self.dls(next_state, depth - 1, path + [move]):
-                return True
-        
-        self.current_path.remove(state_hash)
-        return False
-    
     def solve(self, max_depth=31):
-        """Solve using Iterative Deepening Search with optimizations."""
+        """Solve using IDA*, raising the f-cost bound after each iteration."""
         if not self.is_solvable():
             return None
         
-        for depth in range(max_depth):
-            print(f"\rSearching depth: {depth}", end="")
-            self.visited_states.clear()
-            self.current_path.clear()
-            if self.dls(self.initial_state, depth, []):
-                print()  # New line after depth counter
+        state = self.initial_state
+        i, j = state.get_blank_position()
+        flat_tiles = [tile for row in unpack_board(state.board) for tile in row]
+        tiles = as_array(flat_tiles)
+        moves = as_array([0] * max_depth)
+        
+        pattern_db = pattern_databases()
+        indices = pattern_indices(flat_tiles)
+        pattern_cost = sum(int(pattern_db[group * PATTERN_SIZE + index])
+                           for group, index in enumerate(indices))
+        group_indices = as_array(indices)
+        
+        bound = max(state.heuristic(), pattern_cost)
+        while bound < max_depth:
+            print(f"\rSearching bound: {bound}", end="")
+            length, bound = ida_search(tiles, i * 4 + j, bound, state.manhattan_distance(),
+                                       state.linear_conflict(), pattern_cost, group_indices,
+                                       pattern_db, moves)
+            if length >= 0:
+                print()  # New line after bound counter
+                self.solution = [MOVES[d][2] for d in moves[:length]]
                 return self.solution
         
-        print()  # New line after depth counter
+        print()  # New line after bound counter
         return None
 
 def create_random_board(moves=20):
     """Create a random but solvable puzzle state."""
-    # Initialize board in goal state
-    current_board = []
-    num = 1
-    for i in range(4):
-        row = []
-        for j in range(4):
-            if i == 3 and j == 3:
-                row.append(0)
-            else:
-                row.append(num)
-                num += 1
-        current_board.append(row)
-    
-    blank_pos = [3, 3]  # Initial position of blank tile
-    
-    # Make random moves
+    # Start from the goal and slide the blank at random
+    board = PuzzleState.GOAL_STATE
+    blank = 15
     for _ in range(moves):
-        possible_moves = []
-        # Check all possible moves
-        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:  # Up, Down, Left, Right
-            new_x, new_y = blank_pos[0] + dx, blank_pos[1] + dy
-            if 0 <= new_x < 4 and 0 <= new_y < 4:
-                possible_moves.append((dx, dy))
-        
-        # Make a random move
-        if possible_moves:
-            dx, dy = random.choice(possible_moves)
-            new_x, new_y = blank_pos[0] + dx, blank_pos[1] + dy
-            
-            # Swap blank tile with chosen adjacent tile
-            current_board[blank_pos[0]][blank_pos[1]] = current_board[new_x][new_y]
-            current_board[new_x][new_y] = 0
-            blank_pos = [new_x, new_y]
+        new_blank, _ = random.choice(NEIGHBOR_IDX[blank])
+        board = swap_nibbles(board, blank, new_blank)
+        blank = new_blank
     
-    return PuzzleState(tuple(tuple(row) for row in current_board))
+    return PuzzleState(board, blank_pos=blank)
 
 def print_board(board):
-    """Print the puzzle board in a readable format."""
+    """Print a packed puzzle board in a readable format."""
     print("\n+" + "----+" * 4)
-    for row in board:
+    for row in unpack_board(board):
         print("|", end=" ")
         for num in row:
             if num == 0:
@@ -197,7 +448,7 @@ def print_board(board):
 
 def main():
     while True:
-        print("\n=== 15-Puzzle Solver (IDS) ===")
+        print("\n=== 15-Puzzle Solver (IDA*) ===")
         print("\n1. Use random puzzle")
         print("2. Enter custom puzzle")
         print("3. Exit")
@@ -227,7 +478,7 @@ def main():
                     except ValueError:
                         print("Invalid input. Please enter 4 numbers between 0 and 15")
             
-            initial_state = PuzzleState(tuple(board))
+            initial_state = PuzzleState(pack_board(board))
         else:
             print("Invalid choice. Please try again.")
             continue
@@ -259,21 +510,8 @@ def main():
                 input(f"\nPress Enter to see move {i} ({move})")
                 
                 # Make the move
-                blank_row, blank_col = current_state.get_blank_position()
-                new_board = [list(row) for row in current_state.board]
-                
-                if move == "UP":
-                    new_row, new_col = blank_row + 1, blank_col
-                elif move == "DOWN":
-                    new_row, new_col = blank_row - 1, blank_col
-                elif move == "LEFT":
-                    new_row, new_col = blank_row, blank_col + 1
-                else:  # RIGHT
-                    new_row, new_col = blank_row, blank_col - 1
-                
-                new_board[blank_row][blank_col] = new_board[new_row][new_col]
-                new_board[new_row][new_col] = 0
-                current_state = PuzzleState(tuple(tuple(row) for row in new_board))
+                current_state = next(state for state, name in current_state.get_neighbors()
+                                     if name == move)
                 print_board(current_state.board)
         else:
             print("\nNo solution found within the maximum depth!")
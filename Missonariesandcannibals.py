@@ -1,10 +1,11 @@
-from collections import deque
-
 class State:
+    __slots__ = ('missionaries_left', 'cannibals_left', 'boat_position', 'total_missionaries',
+                 'total_cannibals', 'missionaries_right', 'cannibals_right')
+
     def __init__(self, missionaries_left, cannibals_left, boat_position, total_missionaries, total_cannibals, missionaries_right=None, cannibals_right=None):
         self.missionaries_left = missionaries_left
         self.cannibals_left = cannibals_left
-        self.boat_position = boat_position  # 'left' or 'right'
+        self.boat_position = boat_position  # 0 for the left bank, 1 for the right
         self.total_missionaries = total_missionaries
         self.total_cannibals = total_cannibals
         
@@ -19,27 +20,6 @@ class State:
         else:
             self.cannibals_right = cannibals_right
 
-    def is_valid(self):
-        """Check if the state is valid according to problem constraints."""
-        # Check for negative numbers
-        if (self.missionaries_left < 0 or self.cannibals_left < 0 or
-            self.missionaries_right < 0 or self.cannibals_right < 0):
-            return False
-
-        # Check if missionaries are outnumbered on either bank
-        if (self.missionaries_left > 0 and self.missionaries_left < self.cannibals_left) or \
-           (self.missionaries_right > 0 and self.missionaries_right < self.cannibals_right):
-            return False
-
-        return True
-
-    def is_goal(self):
-        """Check if this is the goal state (everyone on the right bank)."""
-        return (self.missionaries_left == 0 and self.cannibals_left == 0 and
-                self.missionaries_right == self.total_missionaries and 
-                self.cannibals_right == self.total_cannibals and
-                self.boat_position == 'right')
-
     def __eq__(self, other):
         """Define equality for states."""
         return (self.missionaries_left == other.missionaries_left and
@@ -54,7 +34,7 @@ class State:
         """String representation of the state."""
         left_bank = f"Left Bank: {self.missionaries_left}M {self.cannibals_left}C"
         right_bank = f"Right Bank: {self.missionaries_right}M {self.cannibals_right}C"
-        boat = "Boat: " + self.boat_position
+        boat = "Boat: " + ('right' if self.boat_position else 'left')
         return f"{left_bank} | {boat} | {right_bank}"
 
 class MissionariesCannibalsGame:
@@ -62,9 +42,9 @@ class MissionariesCannibalsGame:
         self.total_missionaries = total_missionaries
         self.total_cannibals = total_cannibals
         self.boat_capacity = boat_capacity
-        self.initial_state = State(total_missionaries, total_cannibals, 'left', 
-                                 total_missionaries, total_cannibals)
         self.moves = self.generate_possible_moves()
+        # Search states are single ints: missionaries | cannibals | boat bit
+        self.count_bits = max(total_missionaries, total_cannibals, 1).bit_length()
 
     def generate_possible_moves(self):
         """Generate all possible moves based on boat capacity."""
@@ -74,69 +54,123 @@ class MissionariesCannibalsGame:
             for c in range(self.boat_capacity + 1):
                 if 1 <= m + c <= self.boat_capacity:
                     moves.append((m, c))
-        return moves
+        return tuple(moves)
+
+    def is_valid(self, missionaries_left, cannibals_left):
+        """Check the problem constraints for raw left-bank counts."""
+        missionaries_right = self.total_missionaries - missionaries_left
+        cannibals_right = self.total_cannibals - cannibals_left
+        if (missionaries_left < 0 or cannibals_left < 0 or
+            missionaries_right < 0 or cannibals_right < 0):
+            return False
+        return ((missionaries_left == 0 or missionaries_left >= cannibals_left) and
+                (missionaries_right == 0 or missionaries_right >= cannibals_right))
+
+    def encode(self, missionaries_left, cannibals_left, boat):
+        """Pack left-bank counts and the boat bank (0 left, 1 right) into one int."""
+        return (((missionaries_left << self.count_bits) | cannibals_left) << 1) | boat
+
+    def decode(self, state):
+        """Unpack an encoded state into (missionaries_left, cannibals_left, boat)."""
+        return (state >> (self.count_bits + 1),
+                (state >> 1) & ((1 << self.count_bits) - 1),
+                state & 1)
 
     def get_next_states(self, current_state):
-        """Generate all possible next states from current state."""
-        next_states = []
-        
-        # Determine direction of movement based on boat position
-        if current_state.boat_position == 'left':
-            direction = -1  # Moving from left to right
-            new_boat_position = 'right'
-        else:
-            direction = 1   # Moving from right to left
-            new_boat_position = 'left'
+        """Generate all valid encoded states reachable in one crossing."""
+        missionaries_left, cannibals_left, boat = self.decode(current_state)
+        # People leave the left bank when the boat is there and return otherwise
+        direction = -1 if boat == 0 else 1
+        new_boat = 1 - boat
 
-        # Try each possible move
+        next_states = []
         for m, c in self.moves:
-            if current_state.boat_position == 'left':
-                new_state = State(
-                    current_state.missionaries_left - m,
-                    current_state.cannibals_left - c,
-                    new_boat_position,
-                    self.total_missionaries,
-                    self.total_cannibals
-                )
-            else:
-                new_state = State(
-                    current_state.missionaries_left + m,
-                    current_state.cannibals_left + c,
-                    new_boat_position,
-                    self.total_missionaries,
-                    self.total_cannibals
-                )
-
-            if new_state.is_valid():
-                next_states.append(new_state)
+            new_missionaries = missionaries_left + direction * m
+            new_cannibals = cannibals_left + direction * c
+            if self.is_valid(new_missionaries, new_cannibals):
+                next_states.append(self.encode(new_missionaries, new_cannibals, new_boat))
 
         return next_states
 
-    def solve(self):
-        """Solve the problem using BFS."""
-        start_state = self.initial_state
-        if start_state.is_goal():
-            return [start_state]
-
-        queue = deque([[start_state]])
-        visited = {start_state}
+    def to_state(self, state):
+        """Expand an encoded state into a State for display."""
+        missionaries_left, cannibals_left, boat = self.decode(state)
+        return State(missionaries_left, cannibals_left, boat,
+                     self.total_missionaries, self.total_cannibals)
 
-        while queue:
-            path = queue.popleft()
-            current_state = path[-1]
+    def solve(self):
+        """Solve the problem using bidirectional BFS."""
+        start_state = self.encode(self.total_missionaries, self.total_cannibals, 0)
+        goal_state = self.encode(0, 0, 1)
+        if start_state == goal_state:
+            return [self.to_state(start_state)]
+        if not self.is_valid(0, 0):
+            return None  # Cannibals would outnumber missionaries on the right bank
+
+        # Every crossing can be undone, so the backward search from the goal
+        # uses the same successor function as the forward search
+        forward_parent = {start_state: None}
+        backward_parent = {goal_state: None}
+        forward_frontier = [start_state]
+        backward_frontier = [goal_state]
+
+        while forward_frontier and backward_frontier:
+            # Grow whichever side has the smaller frontier by one full layer
+            if len(forward_frontier) <= len(backward_frontier):
+                forward_frontier, meeting_state = self.expand_layer(
+                    forward_frontier, forward_parent, backward_parent)
+            else:
+                backward_frontier, meeting_state = self.expand_layer(
+                    backward_frontier, backward_parent, forward_parent)
 
-            for next_state in self.get_next_states(current_state):
-                if next_state not in visited:
-                    visited.add(next_state)
-                    new_path = list(path)
-                    new_path.append(next_state)
+            if meeting_state is not None:
+                return self.reconstruct_path(forward_parent, backward_parent, meeting_state)
 
-                    if next_state.is_goal():
-                        return new_path
+        return None
 
-                    queue.append(new_path)
+    def expand_layer(self, frontier, parent, other_parent):
+        """Expand one BFS layer, returning the next frontier and the best meeting state."""
+        next_frontier = []
+        meeting_state = None
+        best_length = None
 
-        return None
+        for current_state in frontier:
+            for next_state in self.get_next_states(current_state):
+                if next_state not in parent:
+                    parent[next_state] = current_state
+                    next_frontier.append(next_state)
+
+                    # Meetings in this layer share a depth on this side but not
+                    # on the other, so keep the one giving the shortest path
+                    if next_state in other_parent:
+                        length = self.path_depth(other_parent, next_state)
+                        if best_length is None or length < best_length:
+                            meeting_state, best_length = next_state, length
+
+        return next_frontier, meeting_state
+
+    def path_depth(self, parent, state):
+        """Count the steps from state back to the root of its parent map."""
+        depth = 0
+        while parent[state] is not None:
+            state = parent[state]
+            depth += 1
+        return depth
+
+    def reconstruct_path(self, forward_parent, backward_parent, meeting_state):
+        """Splice the forward and backward parent chains through meeting_state."""
+        path = []
+        state = meeting_state
+        while state is not None:
+            path.append(self.to_state(state))
+            state = forward_parent[state]
+        path.reverse()
+
+        state = backward_parent[meeting_state]
+        while state is not None:
+            path.append(self.to_state(state))
+            state = backward_parent[state]
+        return path
 
 def get_valid_input(prompt, min_value=1):
     """Get valid numeric input from user."""
@@ -1,27 +1,80 @@
 import time
 import os
+from functools import lru_cache
+import sys
+import shutil
 import platform
 
-class Disk:
-    def __init__(self, size):
-        self.size = size
-    
-    def __str__(self):
-        return str(self.size)
-    
-    def __repr__(self):
-        return f"Disk({self.size})"
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:  # Numba is optional; the move kernel then runs as plain Python
+    np = None
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that returns the function unchanged."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Cursor home followed by erase display
+CLEAR_SCREEN = "\x1b[H\x1b[2J"
+
+@lru_cache(maxsize=None)
+def enable_ansi_escapes():
+    """Prepare the console for ANSI escapes once and report whether to use them."""
+    if platform.system() == 'Windows':
+        # Running any command through cmd.exe leaves the console with
+        # virtual terminal processing enabled
+        os.system("")
+    return os.environ.get('TERM') != 'dumb'
+
+def move_buffer(size):
+    """Allocate a zeroed buffer for the move kernel (a plain list without numpy)."""
+    return np.zeros(size, dtype=np.int8) if np is not None else [0] * size
+
+@njit(cache=True)
+def _hanoi_moves(num_disks, out):
+    """Fill out with the (from, to) peg pairs of the optimal solution, flattened.
     
-    def __lt__(self, other):
-        if other is None:
-            return False
-        return self.size < other.size
+    Move m (1-based) shifts disk number "trailing zeros of m" from peg
+    (m & (m - 1)) % 3 to peg ((m | (m - 1)) + 1) % 3. That sends the
+    tower to peg C for an odd disk count and to peg B for an even one,
+    so pegs B and C are swapped when the count is even.
+    """
+    swap = 1 - (num_disks & 1)
+    for m in range(1, 1 << num_disks):
+        source = (m & (m - 1)) % 3
+        target = ((m | (m - 1)) + 1) % 3
+        if swap:
+            source = (3 - source) % 3
+            target = (3 - target) % 3
+        out[2 * m - 2] = source
+        out[2 * m - 1] = target
+    return out
+
+@lru_cache(maxsize=None)
+def _fs(num_pegs, num_disks):
+    """Minimum number of moves for num_disks disks on num_pegs pegs (Frame-Stewart)."""
+    if num_disks <= 1:
+        return num_disks
+    if num_pegs == 3:
+        return 2 ** num_disks - 1
+    return min(2 * _fs(num_pegs, k) + _fs(num_pegs - 1, num_disks - k)
+               for k in range(1, num_disks))
+
+def _fs_split(num_pegs, num_disks):
+    """Number of top disks to park on a spare peg in an optimal Frame-Stewart solution."""
+    return min(range(1, num_disks),
+               key=lambda k: 2 * _fs(num_pegs, k) + _fs(num_pegs - 1, num_disks - k))
 
 class Tower:
-    def __init__(self, name, capacity):
+    __slots__ = ('name', 'disks')
+    
+    def __init__(self, name):
         self.name = name
+        # Disks are plain ints equal to their size, bottom disk first
         self.disks = []
-        self.capacity = capacity
     
     def add_disk(self, disk):
         if not self.disks or disk < self.disks[-1]:
@@ -40,43 +93,46 @@ class Tower:
         return self.disks[-1]
     
     def __str__(self):
-        return f"Tower {self.name}: {[str(disk) for disk in self.disks]}"
+        return f"Tower {self.name}: {self.disks}"
     
     def __repr__(self):
         return f"Tower({self.name}, {self.disks})"
 
 class HanoiState:
-    def __init__(self, num_disks):
+    def __init__(self, num_disks, num_pegs=3):
         self.num_disks = num_disks
-        self.towers = [
-            Tower('A', num_disks),
-            Tower('B', num_disks),
-            Tower('C', num_disks)
-        ]
+        self.num_pegs = num_pegs
+        # One bitmask per tower: bit i is set when the disk of size i + 1 is
+        # on it, so the top (smallest) disk is always the lowest set bit
+        self.full_mask = (1 << num_disks) - 1
+        self.masks = [self.full_mask] + [0] * (num_pegs - 1)
         self.moves = []
         self.current_move = -1
-        
-        # Initialize the first tower with all disks
-        for size in range(num_disks, 0, -1):
-            self.towers[0].add_disk(Disk(size))
+    
+    @property
+    def towers(self):
+        """Build Tower snapshots of the bitmasks, bottom disk first, for display."""
+        towers = []
+        for index, mask in enumerate(self.masks):
+            tower = Tower(chr(ord('A') + index))
+            tower.disks = [size for size in range(self.num_disks, 0, -1) if mask >> (size - 1) & 1]
+            towers.append(tower)
+        return towers
     
     def is_valid_move(self, from_tower, to_tower):
-        if not (0 <= from_tower < 3 and 0 <= to_tower < 3):
+        if not (0 <= from_tower < self.num_pegs and 0 <= to_tower < self.num_pegs):
             return False
         
-        source = self.towers[from_tower]
-        target = self.towers[to_tower]
-        
-        if not source.disks:
-            return False
-        
-        return target.peek() is None or source.peek() < target.peek()
+        source_top = self.masks[from_tower] & -self.masks[from_tower]
+        target_top = self.masks[to_tower] & -self.masks[to_tower]
+        return bool(source_top) and (not target_top or source_top < target_top)
     
     def make_move(self, from_tower, to_tower):
         if self.is_valid_move(from_tower, to_tower):
-            disk = self.towers[from_tower].remove_disk()
-            self.towers[to_tower].add_disk(disk)
-            self.moves.append((from_tower, to_tower, disk.size))
+            top = self.masks[from_tower] & -self.masks[from_tower]
+            self.masks[from_tower] ^= top
+            self.masks[to_tower] |= top
+            self.moves.append((from_tower, to_tower, top.bit_length()))
             self.current_move += 1
             return True
         return False
@@ -84,81 +140,226 @@ class HanoiState:
     def undo_move(self):
         if self.current_move >= 0:
             from_tower, to_tower, disk_size = self.moves[self.current_move]
-            disk = self.towers[to_tower].remove_disk()
-            self.towers[from_tower].add_disk(disk)
+            top = 1 << (disk_size - 1)
+            self.masks[to_tower] ^= top
+            self.masks[from_tower] |= top
             self.current_move -= 1
             return True
         return False
     
     def is_solved(self):
-        return len(self.towers[2].disks) == self.num_disks
+        return self.masks[-1] == self.full_mask
 
 class HanoiVisualizer:
     def __init__(self, max_disk_width=20):
         self.max_disk_width = max_disk_width
         self.clear_command = 'cls' if platform.system() == 'Windows' else 'clear'
+        # Only terminals that declare themselves dumb keep shelling out to clear
+        self.use_ansi = enable_ansi_escapes()
+        self._prev_frame = None
+        self._prev_header = None
+        # _cells[size] is the rendered cell for a disk, _cells[0] the bare rod
+        self._cells = []
     
     def clear_screen(self):
-        os.system(self.clear_command)
+        if self.use_ansi:
+            sys.stdout.write(CLEAR_SCREEN)
+            sys.stdout.flush()
+        else:
+            os.system(self.clear_command)
     
-    def display_state(self, state, move_count=None, delay=0):
-        self.clear_screen()
-        print("\n=== Towers of Hanoi ===")
-        if move_count is not None:
-            print(f"Move: {move_count}")
+    def display_state(self, state, move_count=None, delay=0, changed=None):
+        """Draw the towers, repainting only changed cells when possible.
         
-        # Get maximum tower height
-        max_height = state.num_disks
+        changed lists the tower indices that may differ from the previous
+        frame; without it the whole screen is cleared and redrawn.
+        """
+        header = f"Move: {move_count}" if move_count is not None else None
+        frame = self._render_rows(state.towers, state.num_disks)
         
-        # Display towers
+        if changed is not None and self._can_diff(frame, header):
+            parts = self._diff_frame(frame, header, changed)
+        else:
+            parts = self._full_frame(frame, header)
+        self._prev_frame = frame
+        self._prev_header = header
+        
+        # Emit the whole frame with a single write
+        sys.stdout.write("".join(parts))
+        sys.stdout.flush()
+        
+        if delay > 0:
+            time.sleep(delay)
+    
+    def _render_rows(self, towers, max_height):
+        """Render the tower rows, top level first, as lists of per-tower cells."""
+        if len(self._cells) <= max_height:
+            self._cells = ["|".center(self.max_disk_width)] + [
+                f"{'#' * (size * 2 - 1):^{self.max_disk_width}}" for size in range(1, max_height + 1)]
+        rendered = self._cells
+        empty = rendered[0]
+        
+        frame = []
         for level in range(max_height - 1, -1, -1):
-            row = ""
-            for tower in state.towers:
-                if level < len(tower.disks):
-                    disk = tower.disks[level]
-                    disk_width = disk.size * 2 - 1
-                    disk_str = f"{'#' * disk_width:^{self.max_disk_width}}"
-                else:
-                    disk_str = f"|".center(self.max_disk_width)
-                row += disk_str + " "
-            print(row)
+            frame.append([rendered[tower.disks[level]] if level < len(tower.disks) else empty
+                          for tower in towers])
+        return frame
+    
+    def _can_diff(self, frame, header):
+        """Check whether the previous frame is still on screen at known positions."""
+        if not self.use_ansi or not sys.stdout.isatty() or self._prev_frame is None:
+            return False
+        if len(frame) != len(self._prev_frame) or len(frame[0]) != len(self._prev_frame[0]):
+            return False
+        if (header is None) != (self._prev_header is None):
+            return False
+        # Absolute cursor positions are only valid while no row wraps and
+        # nothing has scrolled
+        size = shutil.get_terminal_size()
+        return (len(frame[0]) * (self.max_disk_width + 1) <= size.columns and
+                len(frame) + 5 < size.lines)
+    
+    def _full_frame(self, frame, header):
+        """Build the output that clears the screen and draws the whole frame."""
+        parts = []
+        if not self.use_ansi:
+            self.clear_screen()
+        elif sys.stdout.isatty():
+            parts.append(CLEAR_SCREEN)
+        
+        parts.append("\n=== Towers of Hanoi ===\n")
+        if header is not None:
+            parts.append(header + "\n")
+        
+        # Display towers
+        for cells in frame:
+            parts.append(" ".join(cells) + " \n")
+        
+        num_towers = len(frame[0])
         
         # Display tower bases
         base_line = "=" * self.max_disk_width
-        print(f"{base_line} {base_line} {base_line}")
+        parts.append(" ".join([base_line] * num_towers) + "\n")
         
         # Display tower labels
-        labels = "A".center(self.max_disk_width) + " " + \
-                "B".center(self.max_disk_width) + " " + \
-                "C".center(self.max_disk_width)
-        print(labels)
+        labels = " ".join(chr(ord('A') + index).center(self.max_disk_width)
+                          for index in range(num_towers))
+        parts.append(labels + "\n")
+        return parts
+    
+    def _diff_frame(self, frame, header, changed):
+        """Build cursor-addressed writes for the cells that differ from the last frame."""
+        # Screen line 1 is blank and line 2 holds the title
+        top = 3 if header is None else 4
+        parts = []
+        if header != self._prev_header:
+            parts.append(f"\x1b[3;1H{header}\x1b[K")
         
-        if delay > 0:
-            time.sleep(delay)
+        cell_width = self.max_disk_width + 1
+        for row, (old_cells, new_cells) in enumerate(zip(self._prev_frame, frame)):
+            for tower in changed:
+                if old_cells[tower] != new_cells[tower]:
+                    parts.append(f"\x1b[{top + row};{tower * cell_width + 1}H{new_cells[tower]}")
+        
+        # Leave the cursor below the labels, where a full frame would end, and
+        # erase anything printed there since the last full frame
+        parts.append(f"\x1b[{top + len(frame) + 2};1H\x1b[J")
+        return parts
 
 class HanoiSolver:
-    def __init__(self, num_disks, visualizer=None, delay=0.5):
-        self.state = HanoiState(num_disks)
+    def __init__(self, num_disks, visualizer=None, delay=0.5, num_pegs=3, fps=30):
+        self.state = HanoiState(num_disks, num_pegs)
         self.visualizer = visualizer
         self.delay = delay
+        # Moves made faster than fps are drawn together in the next frame
+        self.frame_interval = 1 / fps if fps else 0
+        self._last_render = float('-inf')
+        self._pending_towers = set()
     
     def solve(self):
-        """Solve the puzzle using recursion."""
-        self._move_tower(self.state.num_disks, 0, 2, 1)
+        """Solve the puzzle move by move when animating, in one batch otherwise.
+        
+        With more than three pegs the Frame-Stewart strategy is used instead.
+        """
+        num_pegs = self.state.num_pegs
+        if num_pegs > 3:
+            self._move_tower_fs(self.state.num_disks, 0, num_pegs - 1, list(range(1, num_pegs - 1)))
+        elif self.visualizer is None:
+            return self.solve_iter()
+        else:
+            self._move_tower(self.state.num_disks, 0, 2, 1)
+        
+        # Draw whatever moves were still waiting for a frame
+        if self.visualizer and self._pending_towers:
+            self._render()
+        return self.state.moves
+    
+    def solve_iter(self):
+        """Solve the puzzle without recursion by applying the precomputed moves."""
+        num_disks = self.state.num_disks
+        flat = _hanoi_moves(num_disks, move_buffer(2 * ((1 << num_disks) - 1)))
+        if np is not None:
+            flat = flat.tolist()
+        moves = zip(flat[0::2], flat[1::2])
+        
+        masks = self.state.masks
+        record = self.state.moves.append
+        for from_tower, to_tower in moves:
+            top = masks[from_tower] & -masks[from_tower]
+            masks[from_tower] ^= top
+            masks[to_tower] |= top
+            record((from_tower, to_tower, top.bit_length()))
+        self.state.current_move = len(self.state.moves) - 1
         return self.state.moves
     
     def _move_tower(self, height, source, target, auxiliary):
-        if height >= 1:
-            # Move n-1 disks from source to auxiliary
-            self._move_tower(height - 1, source, auxiliary, target)
-            
-            # Move the largest disk from source to target
-            self.state.make_move(source, target)
-            if self.visualizer:
-                self.visualizer.display_state(self.state, len(self.state.moves), self.delay)
-            
-            # Move n-1 disks from auxiliary to target
-            self._move_tower(height - 1, auxiliary, target, source)
+        # Work stack of (height, source, target, auxiliary, phase) frames; phase 0
+        # still has to clear the smaller disks, phase 1 moves the largest one
+        stack = [(height, source, target, auxiliary, 0)]
+        while stack:
+            height, source, target, auxiliary, phase = stack.pop()
+            if height < 1:
+                continue
+            if phase == 0:
+                # Move n-1 disks from source to auxiliary first
+                stack.append((height, source, target, auxiliary, 1))
+                stack.append((height - 1, source, auxiliary, target, 0))
+            else:
+                # Move the largest disk from source to target
+                self._move_disk(source, target)
+                
+                # Then move n-1 disks from auxiliary to target
+                stack.append((height - 1, auxiliary, target, source, 0))
+    
+    def _move_tower_fs(self, height, source, target, spares):
+        """Move a tower using every spare peg, splitting it at the Frame-Stewart optimum."""
+        if height == 1:
+            self._move_disk(source, target)
+        elif len(spares) == 1:
+            self._move_tower(height, source, target, spares[0])
+        elif height > 1:
+            k = _fs_split(len(spares) + 2, height)
+            parking, others = spares[0], spares[1:]
+            # Park the top k disks with all pegs, move the rest without the
+            # parking peg, then bring the k disks back on top
+            self._move_tower_fs(k, source, parking, [target] + others)
+            self._move_tower_fs(height - k, source, target, others)
+            self._move_tower_fs(k, parking, target, [source] + others)
+    
+    def _move_disk(self, source, target):
+        self.state.make_move(source, target)
+        if self.visualizer:
+            self._pending_towers.update((source, target))
+            if time.monotonic() - self._last_render >= self.frame_interval:
+                self._render()
+    
+    def _render(self):
+        # Stamp before drawing so the per-frame delay counts toward the interval
+        self._last_render = time.monotonic()
+        changed = tuple(self._pending_towers)
+        self._pending_towers.clear()
+        self.visualizer.display_state(self.state, len(self.state.moves), self.delay,
+                                      changed=changed)
 
 def main():
     while True:
@@ -170,19 +371,27 @@ def main():
                 print("Please enter a positive number")
                 continue
             
+            # Large towers can be solved without drawing every move
+            animate = True
             if num_disks > 8:
                 print("Warning: Using more than 8 disks might be hard to visualize")
-                confirm = input("Continue anyway? (y/n): ")
-                if confirm.lower() != 'y':
-                    continue
+                confirm = input("Animate anyway? (y/n, n solves without animation): ")
+                animate = confirm.lower() == 'y'
+            
+            pegs = input("Enter the number of pegs (3 or more, default 3): ").strip()
+            num_pegs = int(pegs) if pegs else 3
+            if num_pegs < 3:
+                print("At least 3 pegs are needed")
+                continue
             
             # Initialize visualizer and solver
-            visualizer = HanoiVisualizer(max_disk_width=20)
-            solver = HanoiSolver(num_disks, visualizer, delay=0.5)
+            visualizer = HanoiVisualizer(max_disk_width=20) if animate else None
+            solver = HanoiSolver(num_disks, visualizer, delay=0.5, num_pegs=num_pegs)
             
             # Display initial state
-            visualizer.display_state(solver.state, move_count=0)
-            input("\nPress Enter to start solving...")
+            if visualizer:
+                visualizer.display_state(solver.state, move_count=0)
+                input("\nPress Enter to start solving...")
             
             # Solve the puzzle
             start_time = time.time()
@@ -196,7 +405,9 @@ def main():
             print(f"\nPuzzle solved!")
             print(f"Total moves: {total_moves}")
             print(f"Time taken: {time_taken:.2f} seconds")
-            print(f"Minimum possible moves: {2**num_disks - 1}")
+            print(f"Minimum possible moves: {_fs(num_pegs, num_disks)}")
+            if num_pegs > 3:
+                print(f"Minimum moves with 3 pegs: {2**num_disks - 1}")
             
             # Ask to try again
             again = input("\nWould you like to solve another puzzle? (y/n): ")
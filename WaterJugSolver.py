@@ -1,77 +1,264 @@
 from collections import deque
+from math import gcd
+
+# IDDFS repeats a full search per depth, so main only runs it while the two
+# capacities together are at most this
+IDDFS_MAX_TOTAL_CAPACITY = 500
 
 class WaterJugSolver:
     def __init__(self, jug1_capacity, jug2_capacity, target):
         self.jug1_capacity = jug1_capacity
         self.jug2_capacity = jug2_capacity
         self.target = target
-        self.visited = set()
-        
-    def get_next_states(self, state):
-        """Generate all possible next states from current state."""
-        jug1, jug2 = state
-        next_states = []
-        
-        # Fill jug1
-        next_states.append((self.jug1_capacity, jug2))
-        
-        # Fill jug2
-        next_states.append((jug1, self.jug2_capacity))
-        
-        # Empty jug1
-        next_states.append((0, jug2))
+        # By Bezout's identity only multiples of the gcd can ever be measured
+        self._gcd = gcd(jug1_capacity, jug2_capacity)
+        self._feasible = (target % self._gcd == 0 and
+                          target <= max(jug1_capacity, jug2_capacity))
+        # Search states are packed into one int as (jug1 << shift) | jug2
+        self._shift = max(jug1_capacity, jug2_capacity).bit_length()
+        self._mask = (1 << self._shift) - 1
+        # Packed values that do not depend on the state being expanded
+        self._full_jug1 = jug1_capacity << self._shift
         
-        # Empty jug2
-        next_states.append((jug1, 0))
-        
-        # Pour from jug1 to jug2
-        pour_amount = min(jug1, self.jug2_capacity - jug2)
-        next_states.append((jug1 - pour_amount, jug2 + pour_amount))
+    def pack(self, jug1, jug2):
+        """Pack a (jug1, jug2) pair into a single int state."""
+        return (jug1 << self._shift) | jug2
+
+    def unpack(self, state):
+        """Unpack an int state into its (jug1, jug2) pair."""
+        return state >> self._shift, state & self._mask
+
+    def successors(self, state):
+        """Return the six packed states one move away from state."""
+        shift = self._shift
+        jug1 = state >> shift
+        jug2 = state & self._mask
+        empty_jug2 = state ^ jug2
+        pour_1_to_2 = min(jug1, self.jug2_capacity - jug2)
+        pour_2_to_1 = min(jug2, self.jug1_capacity - jug1)
         
-        # Pour from jug2 to jug1
-        pour_amount = min(jug2, self.jug1_capacity - jug1)
-        next_states.append((jug1 + pour_amount, jug2 - pour_amount))
+        return (self._full_jug1 | jug2,            # Fill jug1
+                empty_jug2 | self.jug2_capacity,  # Fill jug2
+                jug2,                             # Empty jug1
+                empty_jug2,                       # Empty jug2
+                state - (pour_1_to_2 << shift) + pour_1_to_2,   # Pour from jug1 to jug2
+                state + (pour_2_to_1 << shift) - pour_2_to_1)   # Pour from jug2 to jug1
+
+    def get_next_states(self, state, visited):
+        """Yield unseen packed next states, recording each one's parent in visited."""
+        for next_state in self.successors(state):
+            if next_state not in visited:
+                visited[next_state] = state
+                yield next_state
+
+    def on_boundary(self, jug1, jug2):
+        """Check whether a jug is empty or full, which holds for every reachable state."""
+        return jug1 == 0 or jug2 == 0 or jug1 == self.jug1_capacity or jug2 == self.jug2_capacity
+
+    def get_prev_states(self, state, visited):
+        """Yield unseen packed states one move before state, recording state as their successor."""
+        jug1, jug2 = self.unpack(state)
+        j1c = self.jug1_capacity
+        j2c = self.jug2_capacity
+        previous = []
+        if jug1 == 0 or jug1 == j1c:   # Jug1 was emptied or filled from any level
+            previous.extend((amount, jug2) for amount in range(j1c + 1))
+        if jug2 == 0 or jug2 == j2c:   # Jug2 was emptied or filled from any level
+            previous.extend((jug1, amount) for amount in range(j2c + 1))
+        if jug1 == 0:     # Poured jug1 into jug2 until jug1 ran dry
+            previous.extend((amount, jug2 - amount) for amount in range(1, min(jug2, j1c) + 1))
+        if jug2 == j2c:   # Poured jug1 into jug2 until jug2 was full
+            previous.extend((jug1 + amount, j2c - amount)
+                            for amount in range(1, min(j2c, j1c - jug1) + 1))
+        if jug2 == 0:     # Poured jug2 into jug1 until jug2 ran dry
+            previous.extend((jug1 - amount, amount) for amount in range(1, min(jug1, j2c) + 1))
+        if jug1 == j1c:   # Poured jug2 into jug1 until jug1 was full
+            previous.extend((j1c - amount, jug2 + amount)
+                            for amount in range(1, min(j1c, j2c - jug2) + 1))
+
+        for prev_jug1, prev_jug2 in previous:
+            prev_state = self.pack(prev_jug1, prev_jug2)
+            # States off the boundary can never be reached from (0, 0)
+            if prev_state not in visited and self.on_boundary(prev_jug1, prev_jug2):
+                visited[prev_state] = state
+                yield prev_state
+
+    def goal_states(self):
+        """Enumerate the reachable-shaped packed states holding the target in either jug."""
+        goals = []
+        if self.target <= self.jug1_capacity:
+            goals.extend((self.target, jug2) for jug2 in range(self.jug2_capacity + 1))
+        if self.target <= self.jug2_capacity:
+            goals.extend((jug1, self.target) for jug1 in range(self.jug1_capacity + 1))
+        return [self.pack(jug1, jug2) for jug1, jug2 in goals if self.on_boundary(jug1, jug2)]
+
+    def reconstruct_path(self, parent, state):
+        """Walk parent pointers back to the start state to build the (jug1, jug2) path."""
+        path = []
+        while state is not None:
+            path.append(self.unpack(state))
+            state = parent[state]
+        path.reverse()
+        return path
+
+    def pour_strategy(self, source_capacity, other_capacity):
+        """Simulate always pouring from the source jug into the other one.
+
+        The source is refilled whenever empty and the other jug emptied
+        whenever full. Returns the (source, other) amounts until either
+        holds the target, which takes O((j1 + j2) / gcd) steps.
+        """
+        source, other = 0, 0
+        path = [(0, 0)]
+        while source != self.target and other != self.target:
+            if source == 0:
+                source = source_capacity
+            elif other == other_capacity:
+                other = 0
+            else:
+                pour_amount = min(source, other_capacity - other)
+                source, other = source - pour_amount, other + pour_amount
+            path.append((source, other))
+        return path
+
+    def solve_analytic(self):
+        """Solve without search by simulating the two canonical pouring strategies."""
+        if not self._feasible:
+            return None
         
-        return [(x, y) for x, y in next_states if (x, y) not in self.visited]
+        forward = self.pour_strategy(self.jug1_capacity, self.jug2_capacity)
+        backward = [(jug1, jug2) for jug2, jug1
+                    in self.pour_strategy(self.jug2_capacity, self.jug1_capacity)]
+        return forward if len(forward) <= len(backward) else backward
 
     def solve_bfs(self):
         """Solve using Breadth-First Search."""
-        self.visited = set()
-        start_state = (0, 0)
-        queue = deque([(start_state, [start_state])])
-        self.visited.add(start_state)
+        if not self._feasible:
+            return None
+        
+        goal_states = set(self.goal_states())
+        start_state = self.pack(0, 0)
+        parent = {start_state: None}
+        if start_state in goal_states:
+            return self.reconstruct_path(parent, start_state)
+        queue = deque([start_state])
 
         while queue:
-            current_state, path = queue.popleft()
-            jug1, jug2 = current_state
+            current_state = queue.popleft()
+            # BFS generates every state at its shortest depth, so the first
+            # goal generated already ends a shortest path
+            for next_state in self.get_next_states(current_state, parent):
+                if next_state in goal_states:
+                    return self.reconstruct_path(parent, next_state)
+                queue.append(next_state)
 
-            if jug1 == self.target or jug2 == self.target:
-                return path
+        return None
+
+    def solve_bidirectional_bfs(self):
+        """Solve using BFS from (0, 0) and backwards from every goal state at once."""
+        if not self._feasible:
+            return None
 
-            for next_state in self.get_next_states(current_state):
-                self.visited.add(next_state)
-                queue.append((next_state, path + [next_state]))
+        start_state = self.pack(0, 0)
+        forward_parent = {start_state: None}
+        backward_parent = {goal_state: None for goal_state in self.goal_states()}
+        if start_state in backward_parent:
+            return [(0, 0)]
+        forward_frontier = [start_state]
+        backward_frontier = list(backward_parent)
+
+        while forward_frontier and backward_frontier:
+            # Grow whichever side has the smaller frontier by one full layer
+            if len(forward_frontier) <= len(backward_frontier):
+                forward_frontier, meeting_state = self.expand_layer(
+                    forward_frontier, forward_parent, backward_parent, self.get_next_states)
+            else:
+                backward_frontier, meeting_state = self.expand_layer(
+                    backward_frontier, backward_parent, forward_parent, self.get_prev_states)
+
+            if meeting_state is not None:
+                path = self.reconstruct_path(forward_parent, meeting_state)
+                state = backward_parent[meeting_state]
+                while state is not None:
+                    path.append(self.unpack(state))
+                    state = backward_parent[state]
+                return path
 
         return None
 
-    def solve_dfs(self):
-        """Solve using Depth-First Search."""
-        self.visited = set()
-        start_state = (0, 0)
-        stack = [(start_state, [start_state])]
-        self.visited.add(start_state)
+    def expand_layer(self, frontier, parent, other_parent, expand):
+        """Expand one BFS layer, returning the next frontier and the best meeting state."""
+        next_frontier = []
+        meeting_state = None
+        best_length = None
+
+        for current_state in frontier:
+            for next_state in expand(current_state, parent):
+                next_frontier.append(next_state)
+
+                # Meetings in this layer share a depth on this side but not
+                # on the other, so keep the one giving the shortest path
+                if next_state in other_parent:
+                    length = self.path_depth(other_parent, next_state)
+                    if best_length is None or length < best_length:
+                        meeting_state, best_length = next_state, length
+
+        return next_frontier, meeting_state
+
+    def path_depth(self, parent, state):
+        """Count the steps from state back to the root of its parent map."""
+        depth = 0
+        while parent[state] is not None:
+            state = parent[state]
+            depth += 1
+        return depth
+
+    def solve_dfs(self, depth_limit=None):
+        """Solve using Depth-First Search, going at most depth_limit moves deep."""
+        if not self._feasible:
+            return None
+        
+        goal_states = set(self.goal_states())
+        start_state = self.pack(0, 0)
+        parent = {start_state: None}
+        if start_state in goal_states:
+            return self.reconstruct_path(parent, start_state)
+        stack = [(start_state, 0)]
+        best_depth = {start_state: 0}
 
         while stack:
-            current_state, path = stack.pop()
-            jug1, jug2 = current_state
+            current_state, depth = stack.pop()
+            # Skip entries superseded by a shallower route to the same state
+            if depth > best_depth[current_state]:
+                continue
+            if depth == depth_limit:
+                continue
 
-            if jug1 == self.target or jug2 == self.target:
-                return path
+            # A state is revisited only when reached in fewer moves, so a
+            # depth limit never hides a goal that fits within it
+            next_depth = depth + 1
+            for next_state in self.successors(current_state):
+                if next_depth < best_depth.get(next_state, next_depth + 1):
+                    best_depth[next_state] = next_depth
+                    parent[next_state] = current_state
+                    if next_state in goal_states:
+                        return self.reconstruct_path(parent, next_state)
+                    stack.append((next_state, next_depth))
 
-            for next_state in self.get_next_states(current_state):
-                self.visited.add(next_state)
-                stack.append((next_state, path + [next_state]))
+        return None
 
+    def solve_iddfs(self, depth_limit=None):
+        """Solve using iterative-deepening DFS, which finds a shortest path."""
+        if not self._feasible:
+            return None
+        
+        # No shortest path is longer than the number of distinct states
+        if depth_limit is None:
+            depth_limit = (self.jug1_capacity + 1) * (self.jug2_capacity + 1)
+        for limit in range(depth_limit + 1):
+            path = self.solve_dfs(limit)
+            if path is not None:
+                return path
         return None
 
     def print_solution(self, path, method):
@@ -117,13 +304,30 @@ def main():
         # Create solver instance and find solutions
         solver = WaterJugSolver(jug1_capacity, jug2_capacity, target)
         
-        # Solve using BFS
-        bfs_path = solver.solve_bfs()
-        solver.print_solution(bfs_path, "BFS")
+        # Closed-form solution; when it proves the target unreachable, skip the searches
+        analytic_path = solver.solve_analytic()
+        solver.print_solution(analytic_path, "Analytic")
         
-        # Solve using DFS
-        dfs_path = solver.solve_dfs()
-        solver.print_solution(dfs_path, "DFS")
+        if analytic_path is not None:
+            # Solve using BFS
+            bfs_path = solver.solve_bfs()
+            solver.print_solution(bfs_path, "BFS")
+            
+            # Solve using bidirectional BFS
+            bidirectional_path = solver.solve_bidirectional_bfs()
+            solver.print_solution(bidirectional_path, "Bidirectional BFS")
+            
+            # Solve using DFS
+            dfs_path = solver.solve_dfs()
+            solver.print_solution(dfs_path, "DFS")
+            
+            # Solve using iterative-deepening DFS
+            if jug1_capacity + jug2_capacity <= IDDFS_MAX_TOTAL_CAPACITY:
+                iddfs_path = solver.solve_iddfs()
+                solver.print_solution(iddfs_path, "Iterative Deepening DFS")
+            else:
+                print(f"\nIterative Deepening DFS skipped: jug capacities above "
+                      f"{IDDFS_MAX_TOTAL_CAPACITY} units in total")
 
         # Ask if user wants to try another problem
         while True: